@@ -0,0 +1,55 @@
+"""FastAPI dependencies shared by the API routes."""
+
+from fastapi import HTTPException
+
+from app.core.rag_chain import RAGChain, get_rag_chain
+from app.core.vector_store import VectorStoreService, get_vector_store
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def provide_vector_store() -> VectorStoreService:
+    """Provide the shared vector store service to a route.
+
+    Building the service connects to Qdrant. Dependencies run outside the
+    handlers' error handling, so a failure is reported here as 503 rather
+    than escaping to the global exception handler. The service is not
+    cached on failure, so the next request retries.
+
+    Returns:
+        Shared VectorStoreService
+
+    Raises:
+        HTTPException: 503 if the vector store cannot be initialized
+    """
+    try:
+        return get_vector_store()
+    except Exception as e:
+        logger.error(f"Vector store unavailable: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Vector store unavailable: {str(e)}",
+        )
+
+
+def provide_rag_chain() -> RAGChain:
+    """Provide the shared RAG chain to a query route.
+
+    Construction errors are reported the same way the query handlers report
+    failures, as a 500 with the error detail.
+
+    Returns:
+        Shared RAGChain
+
+    Raises:
+        HTTPException: 500 if the RAG chain cannot be initialized
+    """
+    try:
+        return get_rag_chain()
+    except Exception as e:
+        logger.error(f"Error initializing RAG chain: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing query: {str(e)}",
+        )
@@ -1,7 +1,10 @@
 """Document management endpoints."""
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 
+from app.api.dependencies import provide_vector_store
 from app.api.schemas import (
     DocumentListResponse,
     DocumentNameListResponse,
@@ -13,7 +16,11 @@ from app.core.vector_store import VectorStoreService
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/documents", tags=["Documents"])
+router = APIRouter(
+    prefix="/documents",
+    tags=["Documents"],
+    default_response_class=ORJSONResponse,
+)
 
 
 @router.post(
@@ -22,12 +29,14 @@ router = APIRouter(prefix="/documents", tags=["Documents"])
     responses={
         400: {"model": ErrorResponse, "description": "Invalid file type"},
         500: {"model": ErrorResponse, "description": "Processing error"},
+        503: {"model": ErrorResponse, "description": "Vector store unavailable"},
     },
     summary="Upload and ingest a document",
     description="Upload a document (PDF, TXT, or CSV) to be processed and added to the vector store.",
 )
 async def upload_document(
     file: UploadFile = File(..., description="Document file to upload"),
+    vector_store: VectorStoreService = Depends(provide_vector_store),
 ) -> DocumentUploadResponse:
     """Upload and process a document."""
     logger.info(f"Received document upload: {file.filename}")
@@ -40,9 +49,9 @@ async def upload_document(
         )
 
     try:
-        # Process document
+        # Process document off the event loop (blocking file I/O and parsing)
         processor = DocumentProcessor()
-        chunks = processor.process_upload(file.file, file.filename)
+        chunks = await run_in_threadpool(processor.process_upload, file.file, file.filename)
 
         if not chunks:
             raise HTTPException(
@@ -51,8 +60,7 @@ async def upload_document(
             )
 
         # Add to vector store
-        vector_store = VectorStoreService()
-        document_ids = vector_store.add_documents(chunks)
+        document_ids = await vector_store.aadd_documents(chunks)
 
         logger.info(
             f"Successfully processed {file.filename}: "
@@ -83,12 +91,13 @@ async def upload_document(
     summary="Get collection information",
     description="Get information about the document collection.",
 )
-async def get_collection_info() -> DocumentListResponse:
+async def get_collection_info(
+    vector_store: VectorStoreService = Depends(provide_vector_store),
+) -> DocumentListResponse:
     """Get information about the document collection."""
     logger.debug("Collection info requested")
 
     try:
-        vector_store = VectorStoreService()
         info = vector_store.get_collection_info()
 
         # In this RAG system, each point is a vector, so vectors_count equals points_count
@@ -116,12 +125,13 @@ async def get_collection_info() -> DocumentListResponse:
     summary="List all uploaded documents",
     description="Get a list of all unique document names that have been uploaded to the system.",
 )
-async def list_documents() -> DocumentNameListResponse:
+async def list_documents(
+    vector_store: VectorStoreService = Depends(provide_vector_store),
+) -> DocumentNameListResponse:
     """List all unique document names."""
     logger.debug("Document list requested")
 
     try:
-        vector_store = VectorStoreService()
         document_names = vector_store.get_unique_document_names()
 
         return DocumentNameListResponse(
@@ -141,16 +151,18 @@ async def list_documents() -> DocumentNameListResponse:
     responses={
         200: {"description": "Collection deleted successfully"},
         500: {"model": ErrorResponse, "description": "Deletion error"},
+        503: {"model": ErrorResponse, "description": "Vector store unavailable"},
     },
     summary="Delete the entire collection",
     description="Delete all documents from the vector store. Use with caution!",
 )
-async def delete_collection() -> dict:
+async def delete_collection(
+    vector_store: VectorStoreService = Depends(provide_vector_store),
+) -> dict:
     """Delete the entire document collection."""
     logger.warning("Collection deletion requested")
 
     try:
-        vector_store = VectorStoreService()
         vector_store.delete_collection()
 
         return {"message": "Collection deleted successfully"}
@@ -2,9 +2,10 @@
 
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 from app import __version__
+from app.api.dependencies import provide_vector_store
 from app.api.schemas import HealthResponse, ReadinessResponse
 from app.core.vector_store import VectorStoreService
 from app.utils.logger import get_logger
@@ -35,13 +36,14 @@ async def health_check() -> HealthResponse:
     summary="Readiness check",
     description="Checks if the service is ready to handle requests (including DB connectivity).",
 )
-async def readiness_check() -> ReadinessResponse:
+async def readiness_check(
+    vector_store: VectorStoreService = Depends(provide_vector_store),
+) -> ReadinessResponse:
     """Readiness check including database connectivity."""
     logger.debug("Readiness check requested")
 
     try:
         # Check Qdrant connection
-        vector_store = VectorStoreService()
         is_healthy = vector_store.health_check()
 
         if not is_healthy:
@@ -2,9 +2,10 @@
 
 import time
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
+from app.api.dependencies import provide_rag_chain, provide_vector_store
 from app.api.schemas import (
     ErrorResponse,
     EvaluationScores,
@@ -13,6 +14,7 @@ from app.api.schemas import (
     SourceDocument,
 )
 from app.core.rag_chain import RAGChain
+from app.core.vector_store import VectorStoreService
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,7 +31,10 @@ router = APIRouter(prefix="/query", tags=["Query"])
     summary="Ask a question",
     description="Submit a question and get an AI-generated answer based on the ingested documents.",
 )
-async def query(request: QueryRequest) -> QueryResponse:
+async def query(
+    request: QueryRequest,
+    rag_chain: RAGChain = Depends(provide_rag_chain),
+) -> QueryResponse:
     """Process a RAG query."""
     logger.info(
         f"Query received: {request.question[:100]}... "
@@ -38,8 +43,6 @@ async def query(request: QueryRequest) -> QueryResponse:
     start_time = time.time()
 
     try:
-        rag_chain = RAGChain()
-
         # Determine which method to call based on request
         if request.enable_evaluation:
             # Evaluation requires sources, so we always include them
@@ -111,53 +114,45 @@ async def query(request: QueryRequest) -> QueryResponse:
     summary="Ask a question (streaming)",
     description="Submit a question and get a streaming AI-generated answer.",
 )
-async def query_stream(request: QueryRequest) -> StreamingResponse:
+async def query_stream(
+    request: QueryRequest,
+    rag_chain: RAGChain = Depends(provide_rag_chain),
+) -> StreamingResponse:
     """Process a RAG query with streaming response."""
     logger.info(f"Streaming query received: {request.question[:100]}...")
 
-    try:
-        rag_chain = RAGChain()
-
-        async def generate():
-            """Generate streaming response."""
-            try:
-                for chunk in rag_chain.stream(request.question):
-                    yield chunk
-            except Exception as e:
-                logger.error(f"Error in stream: {e}")
-                yield f"\n\nError: {str(e)}"
-
-        return StreamingResponse(
-            generate(),
-            media_type="text/plain",
-        )
-
-    except Exception as e:
-        logger.error(f"Error setting up stream: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error processing query: {str(e)}",
-        )
+    async def generate():
+        """Generate streaming response."""
+        try:
+            for chunk in rag_chain.stream(request.question):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error in stream: {e}")
+            yield f"\n\nError: {str(e)}"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/plain",
+    )
 
 
 @router.post(
     "/search",
     responses={
         500: {"model": ErrorResponse, "description": "Search error"},
+        503: {"model": ErrorResponse, "description": "Vector store unavailable"},
     },
     summary="Search documents",
     description="Search for relevant documents without generating an answer.",
 )
 async def search_documents(
     request: QueryRequest,
+    vector_store: VectorStoreService = Depends(provide_vector_store),
 ) -> dict:
     """Search for relevant documents."""
     logger.info(f"Search received: {request.question[:100]}...")
 
     try:
-        from app.core.vector_store import VectorStoreService
-
-        vector_store = VectorStoreService()
         results = vector_store.search_with_scores(request.question)
 
         documents = [
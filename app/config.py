@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     # Qdrant Cloud Configuration
     qdrant_url: str
     qdrant_api_key: str
+    qdrant_prefer_grpc: bool = False  # Requires the gRPC port (6334) to be reachable
 
     # Collection Settings
     collection_name: str = "rag_documents"
@@ -37,6 +38,15 @@ class Settings(BaseSettings):
     # Retrieval Settings
     retrieval_k: int = 4
 
+    # Ingestion Settings
+    embedding_batch_size: int = 256  # Texts per OpenAI embeddings request
+    upsert_batch_size: int = 64
+    upsert_parallel: int = 4
+
+    # Embedding Cache Settings
+    embedding_cache_size: int = 10000  # In-memory vectors (~6KB each as float32)
+    embedding_cache_redis_url: str | None = None  # Optional shared cache (pip install redis)
+
     # Logging
     log_level: str = "INFO"
 
@@ -188,6 +188,10 @@ class DocumentProcessor:
 
         chunks = self.text_splitter.split_documents(documents)
 
+        # Record each chunk's position so it can be filtered and ordered on
+        for index, chunk in enumerate(chunks):
+            chunk.metadata["chunk"] = index
+
         logger.info(f"Created {len(chunks)} chunks")
         return chunks
 
@@ -1,6 +1,10 @@
 """Embedding generation module using OpenAI embeddings."""
 
+import hashlib
+from array import array
+from collections import OrderedDict
 from functools import lru_cache
+from typing import Any
 
 from langchain_openai import OpenAIEmbeddings
 
@@ -28,6 +32,137 @@ def get_embeddings() -> OpenAIEmbeddings:
     logger.info("Embeddings model initialized successfully")
     return embeddings
 
+
+class EmbeddingCache:
+    """Content-addressed cache of document embeddings.
+
+    Vectors are kept in an in-memory LRU as compact float32 arrays (~6KB per
+    1536-d vector, versus ~50KB as a list of Python floats) and, when a Redis
+    URL is configured, shared across processes through Redis with a TTL.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_size: int,
+        redis_url: str | None = None,
+        ttl_seconds: int = 30 * 24 * 60 * 60,
+    ):
+        """Initialize embedding cache.
+
+        Args:
+            model_name: Embedding model, part of every key so models never mix
+            max_size: Maximum number of vectors kept in memory
+            redis_url: Optional Redis URL for a cross-process cache
+            ttl_seconds: Expiry of Redis entries
+        """
+        self.model_name = model_name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._memory: OrderedDict[bytes, array] = OrderedDict()
+        self._redis: Any = None
+
+        if redis_url:
+            # Optional dependency, only needed for the shared cache
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(redis_url)
+
+    def key(self, text: str) -> bytes:
+        """Compute the cache key for a text.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Digest of the model name and text
+        """
+        return hashlib.blake2b(f"{self.model_name}\0{text}".encode()).digest()
+
+    async def aget_many(self, keys: list[bytes]) -> list[list[float] | None]:
+        """Look up vectors for the given keys.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached vector for each key, or None on a miss
+        """
+        vectors: list[list[float] | None] = []
+        for key in keys:
+            stored = self._memory.get(key)
+            if stored is None:
+                vectors.append(None)
+                continue
+            self._memory.move_to_end(key)
+            vectors.append(stored.tolist())
+
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        if self._redis is not None and misses:
+            try:
+                values = await self._redis.mget([b"emb:" + keys[i] for i in misses])
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                return vectors
+
+            for i, value in zip(misses, values, strict=True):
+                if value is None:
+                    continue
+                try:
+                    stored = array("f", value)
+                except (TypeError, ValueError) as e:
+                    # Corrupt or foreign entry; treat as a miss and re-embed
+                    logger.warning(f"Ignoring malformed embedding cache entry: {e}")
+                    continue
+                vectors[i] = stored.tolist()
+                self._remember(keys[i], stored)
+
+        return vectors
+
+    async def aset_many(self, items: dict[bytes, list[float]]) -> None:
+        """Store vectors in the cache.
+
+        Args:
+            items: Mapping of cache key to vector
+        """
+        stored = {key: array("f", vector) for key, vector in items.items()}
+        for key, vector in stored.items():
+            self._remember(key, vector)
+
+        if self._redis is not None and stored:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key, vector in stored.items():
+                        pipe.setex(b"emb:" + key, self.ttl_seconds, vector.tobytes())
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache store failed: {e}")
+
+    def _remember(self, key: bytes, vector: array) -> None:
+        """Insert a vector into the in-memory LRU, evicting the oldest entry."""
+        if self.max_size <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+
+@lru_cache
+def get_embedding_cache() -> EmbeddingCache:
+    """Get cached embedding cache instance.
+
+    Returns:
+        Configured EmbeddingCache instance
+    """
+    settings = get_settings()
+    return EmbeddingCache(
+        model_name=settings.embedding_model,
+        max_size=settings.embedding_cache_size,
+        redis_url=settings.embedding_cache_redis_url,
+    )
+
+
 class EmbeddingService:
     """Service for generating embeddings."""
 
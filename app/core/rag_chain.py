@@ -1,5 +1,7 @@
 """RAG chain module using LangChain LCEL."""
 
+from functools import lru_cache
+
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
@@ -7,7 +9,7 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_openai import ChatOpenAI
 
 from app.config import get_settings
-from app.core.vector_store import VectorStoreService
+from app.core.vector_store import VectorStoreService, get_vector_store
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -270,4 +272,14 @@ class RAGChain:
                 yield chunk
         except Exception as e:
             logger.error(f"Error streaming query: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+@lru_cache
+def get_rag_chain() -> RAGChain:
+    """Get cached RAG chain instance.
+
+    Returns:
+        Shared RAGChain bound to the cached vector store service
+    """
+    return RAGChain(get_vector_store())
@@ -4,9 +4,8 @@ import asyncio
 import time
 from typing import Any
 
-from datasets import Dataset
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from ragas import evaluate
+from ragas import EvaluationDataset, SingleTurnSample, evaluate
 from ragas.metrics import answer_relevancy, faithfulness
 
 from app.config import get_settings
@@ -120,8 +119,11 @@ class RAGASEvaluator:
         question: str,
         answer: str,
         contexts: list[str],
-    ) -> Dataset:
-        """Convert RAG output to RAGAS Dataset format.
+    ) -> EvaluationDataset:
+        """Convert RAG output to a RAGAS evaluation dataset.
+
+        Builds a single in-memory sample instead of an Arrow-backed
+        ``datasets.Dataset``, which is pure overhead for one row.
 
         Args:
             question: The user's question
@@ -129,22 +131,21 @@ class RAGASEvaluator:
             contexts: List of retrieved context documents
 
         Returns:
-            Dataset object for RAGAS evaluation
+            EvaluationDataset object for RAGAS evaluation
         """
-        # RAGAS expects data in specific format
-        data = {
-            "question": [question],
-            "answer": [answer],
-            "contexts": [contexts],  # List of lists
-        }
+        sample = SingleTurnSample(
+            user_input=question,
+            response=answer,
+            retrieved_contexts=contexts,
+        )
 
         logger.debug(
             f"Prepared dataset with {len(contexts)} contexts " f"for question: {question[:50]}..."
         )
 
-        return Dataset.from_dict(data)
+        return EvaluationDataset(samples=[sample])
 
-    def _evaluate_with_timeout(self, dataset: Dataset) -> dict[str, Any]:
+    def _evaluate_with_timeout(self, dataset: EvaluationDataset) -> dict[str, Any]:
         """Execute RAGAS evaluation with timeout.
 
         Args:
@@ -167,7 +168,18 @@ class RAGASEvaluator:
         )
 
         # Convert to dictionary and extract scores
-        return result.to_pandas().to_dict("records")[0]
+        return self._result_to_rows(result)[0]
+
+    def _result_to_rows(self, result: Any) -> list[dict[str, Any]]:
+        """Convert a RAGAS evaluation result into per-sample score rows.
+
+        Args:
+            result: Result returned by ragas.evaluate
+
+        Returns:
+            List of score dictionaries, one per evaluated sample
+        """
+        return result.to_pandas().to_dict("records")
 
     def _handle_evaluation_error(self, error: Exception) -> dict[str, Any]:
         """Return safe fallback scores on error.
@@ -1,17 +1,40 @@
 """Vector store module for Qdrant operations."""
 
-from functools import lru_cache
-from typing import Any
-from uuid import uuid4
-
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import cached_property, lru_cache
+from itertools import islice
+from threading import Lock
+from typing import Any, ClassVar
+from uuid import NAMESPACE_OID, uuid5
+
+import httpx
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from langchain_core.documents import Document
-from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import (
+    Datatype,
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    MatchValue,
+    OptimizersConfigDiff,
+    PayloadSchemaType,
+    PayloadSelectorInclude,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
 
 from app.config import get_settings
-from app.core.embeddings import get_embeddings
+from app.core.embeddings import get_embedding_cache, get_embeddings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,6 +43,90 @@ settings = get_settings()
 # Embedding dimension for text-embedding-3-small
 EMBEDDING_DIMENSION = 1536
 
+# Uploads larger than this defer HNSW indexing until all points are written
+BULK_MODE_THRESHOLD = 1000
+
+# Qdrant defaults restored after a bulk upload
+DEFAULT_INDEXING_THRESHOLD = 20000
+DEFAULT_HNSW_M = 16
+
+# Connection pool for the Qdrant REST clients, reused across requests
+QDRANT_TIMEOUT_SECONDS = 30
+QDRANT_HTTP_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=32, keepalive_expiry=60
+)
+
+# Collection info and health probes are served from cache for this long
+STATUS_CACHE_TTL_SECONDS = 5
+_info_cache: TTLCache = TTLCache(maxsize=4, ttl=STATUS_CACHE_TTL_SECONDS)
+_health_cache: TTLCache = TTLCache(maxsize=1, ttl=STATUS_CACHE_TTL_SECONDS)
+
+# Payload key holding the document filename (LangChain nests metadata)
+SOURCE_FIELD = "metadata.source"
+
+# Maximum distinct sources returned by the facet query
+SOURCE_FACET_LIMIT = 10000
+
+# Payload indexes for filterable metadata fields
+PAYLOAD_INDEXES = {
+    SOURCE_FIELD: PayloadSchemaType.KEYWORD,
+    "metadata.chunk": PayloadSchemaType.INTEGER,
+    "metadata.page": PayloadSchemaType.INTEGER,
+}
+
+
+def document_id(document: Document) -> str:
+    """Derive a deterministic point ID from a document's content, source and chunk index.
+
+    Re-uploading the same chunk yields the same ID, so upserts replace the
+    existing point instead of creating a duplicate. The chunk index keeps
+    repeated text within one file (headers, footers, CSV rows) distinct.
+
+    Args:
+        document: Document to identify
+
+    Returns:
+        UUID string for the Qdrant point
+    """
+    source = document.metadata.get("source", "")
+    chunk = document.metadata.get("chunk", "")
+    key = "\0".join((document.page_content, source, str(chunk)))
+    digest = hashlib.blake2b(key.encode()).hexdigest()
+    return str(uuid5(NAMESPACE_OID, digest))
+
+
+def _batched(documents: Iterable[Document], size: int) -> Iterator[list[Document]]:
+    """Yield successive lists of up to ``size`` documents from an iterable.
+
+    Args:
+        documents: Documents to batch
+        size: Maximum batch size
+
+    Yields:
+        Lists of documents
+    """
+    iterator = iter(documents)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _qdrant_client_options() -> dict[str, Any]:
+    """Build connection options shared by the sync and async Qdrant clients.
+
+    Returns:
+        Keyword arguments for QdrantClient/AsyncQdrantClient
+    """
+    return {
+        "url": settings.qdrant_url,
+        "api_key": settings.qdrant_api_key,
+        "timeout": QDRANT_TIMEOUT_SECONDS,
+        "prefer_grpc": settings.qdrant_prefer_grpc,
+        # REST transport: HTTP/2 with a keep-alive pool to amortize TCP+TLS setup
+        "http2": True,
+        "limits": QDRANT_HTTP_LIMITS,
+    }
+
+
 @lru_cache
 def get_qdrant_client() -> QdrantClient:
     """Get cached Qdrant client instance.
@@ -29,18 +136,28 @@ def get_qdrant_client() -> QdrantClient:
     """
     logger.info(f"Connecting to Qdrant at: {settings.qdrant_url}")
 
-    client = QdrantClient(
-        url=settings.qdrant_url,
-        api_key=settings.qdrant_api_key,
-    )
+    client = QdrantClient(**_qdrant_client_options())
 
     logger.info("Qdrant client connected successfully")
     return client
 
 
+@lru_cache
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Get cached async Qdrant client instance.
+
+    Returns:
+        Configured AsyncQdrantClient instance
+    """
+    return AsyncQdrantClient(**_qdrant_client_options())
+
+
 class VectorStoreService:
     """Service for managing vector store operations."""
 
+    # Collections already verified/created in this process
+    _ensured: ClassVar[set[str]] = set()
+
     def __init__(self, collection_name: str | None = None):
         """Initialize vector store service.
 
@@ -49,64 +166,247 @@ class VectorStoreService:
         """
         self.collection_name = collection_name or settings.collection_name
         self.client = get_qdrant_client()
+        self.aclient = get_async_qdrant_client()
         self.embeddings = get_embeddings()
+        self.embedding_cache = get_embedding_cache()
 
         # Ensure collection exists
         self._ensure_collection()
 
-        # Initialize LangChain Qdrant vector store
-        self.vector_store = QdrantVectorStore(
+        logger.info(f"VectorStoreService initialized for collection: {self.collection_name}")
+
+    @cached_property
+    def vector_store(self) -> Any:
+        """LangChain Qdrant vector store used for search and retrieval.
+
+        Built on first use so the ingestion path never imports langchain_qdrant.
+        """
+        from langchain_qdrant import QdrantVectorStore
+
+        return QdrantVectorStore(
             client=self.client,
             collection_name=self.collection_name,
             embedding=self.embeddings,
         )
 
-        logger.info(f"VectorStoreService initialized for collection: {self.collection_name}")
-
-
     def _ensure_collection(self) -> None:
         """Ensure the collection exists, create if not."""
-        try:
-            collection_info = self.client.get_collection(self.collection_name)
-            logger.info(
-                f"Collection '{self.collection_name}' exists with "
-                f"{collection_info.points_count} points"
-            )
-        except UnexpectedResponse:
+        if self.collection_name in self._ensured:
+            return
+
+        if not self.client.collection_exists(self.collection_name):
             logger.info(f"Creating collection: {self.collection_name}")
             self.client.create_collection(
                 collection_name=self.collection_name,
+                # fp16 storage with an int8 quantized copy in RAM; searches use the
+                # quantized index and rescore against the fp16 originals
                 vectors_config=VectorParams(
                     size=EMBEDDING_DIMENSION,
                     distance=Distance.COSINE,
+                    datatype=Datatype.FLOAT16,
+                    on_disk=False,
+                ),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True,
+                    ),
                 ),
             )
             logger.info(f"Collection '{self.collection_name}' created successfully")
 
-    def add_documents(self, documents: list[Document]) -> list[str]:
-        """Add documents to the vector store.
+        # Also upgrades collections created before the indexes existed
+        self._ensure_payload_indexes()
+
+        self._ensured.add(self.collection_name)
+
+    def _ensure_payload_indexes(self) -> None:
+        """Create payload indexes for filterable metadata fields.
+
+        Creating an index that already exists is a no-op in Qdrant, so this
+        is safe to run on every service start.
+        """
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            try:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+            except Exception as e:
+                logger.warning(f"Could not create payload index on '{field_name}': {e}")
+
+    async def aadd_documents(
+        self,
+        documents: Iterable[Document],
+        batch_size: int | None = None,
+    ) -> list[str]:
+        """Add documents to the vector store asynchronously.
+
+        Documents are consumed lazily and embedded in batches of
+        ``batch_size`` (one OpenAI request each); the resulting points are
+        upserted in batches of ``settings.upsert_batch_size``. Up to
+        ``settings.upsert_parallel`` requests are in flight, so embedding and
+        upload latency overlap across batches while memory stays bounded.
 
         Args:
-            documents: List of Document objects to add
+            documents: Documents to add (list or any iterable)
+            batch_size: Documents embedded per request (default from settings)
 
         Returns:
             List of document IDs
         """
-        if not documents:
+        batch_size = batch_size or settings.embedding_batch_size
+        upsert_batch_size = settings.upsert_batch_size
+        semaphore = asyncio.Semaphore(settings.upsert_parallel)
+
+        async def _upsert(points: list[PointStruct]) -> None:
+            async with semaphore:
+                await self.aclient.upsert(
+                    collection_name=self.collection_name,
+                    points=points,
+                    wait=False,
+                )
+
+        async def _add_batch(batch: list[Document]) -> list[str]:
+            async with semaphore:
+                vectors = await self._aembed_cached([doc.page_content for doc in batch])
+
+            ids = [document_id(doc) for doc in batch]
+            points = self._build_points(ids, vectors, batch)
+            await asyncio.gather(
+                *(
+                    _upsert(points[i : i + upsert_batch_size])
+                    for i in range(0, len(points), upsert_batch_size)
+                )
+            )
+            return ids
+
+        tasks: list[asyncio.Task[list[str]]] = []
+        pending: set[asyncio.Task[list[str]]] = set()
+        count = 0
+        bulk = False
+
+        async with AsyncExitStack() as stack:
+            try:
+                for batch in _batched(documents, batch_size):
+                    # The total is unknown for generators, so switch once it's large
+                    count += len(batch)
+                    if not bulk and count > BULK_MODE_THRESHOLD:
+                        await stack.enter_async_context(self.bulk_mode())
+                        bulk = True
+
+                    # Don't read further ahead than the batches we can have in flight
+                    if len(pending) >= settings.upsert_parallel:
+                        await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    # Stop reading on the first failed batch
+                    done = {task for task in pending if task.done()}
+                    pending -= done
+                    for task in done:
+                        task.result()
+
+                    task = asyncio.create_task(_add_batch(batch))
+                    pending.add(task)
+                    tasks.append(task)
+
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # Settle in-flight batches before bulk mode restores indexing
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        if not tasks:
             logger.warning("No documents to add")
             return []
 
-        logger.info(f"Adding {len(documents)} documents to collection")
+        ids = [point_id for batch_ids in results for point_id in batch_ids]
 
-        # Generate unique IDs for each document
-        ids = [str(uuid4()) for _ in documents]
+        _info_cache.pop(hashkey(self.collection_name), None)
 
-        # Add to vector store
-        self.vector_store.add_documents(documents, ids=ids)
-
-        logger.info(f"Successfully added {len(documents)} documents")
+        logger.info(f"Successfully added {len(ids)} documents in {len(tasks)} batches")
         return ids
 
+    @staticmethod
+    def _build_points(
+        ids: list[str],
+        vectors: list[list[float]],
+        documents: list[Document],
+    ) -> list[PointStruct]:
+        """Build Qdrant points using LangChain's payload layout.
+
+        Args:
+            ids: Point IDs
+            vectors: Embedding vectors
+            documents: Source documents
+
+        Returns:
+            List of PointStruct objects ready for upsert
+        """
+        return [
+            PointStruct(
+                id=point_id,
+                vector=vector,
+                payload={"page_content": doc.page_content, "metadata": doc.metadata},
+            )
+            for point_id, vector, doc in zip(ids, vectors, documents, strict=True)
+        ]
+
+    async def _aembed_cached(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, reusing cached vectors for previously seen content.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vector for each text
+        """
+        keys = [self.embedding_cache.key(text) for text in texts]
+        vectors = await self.embedding_cache.aget_many(keys)
+
+        # Embed each distinct missing text once
+        missing = {
+            key: text
+            for key, text, vector in zip(keys, texts, vectors, strict=True)
+            if vector is None
+        }
+        if missing:
+            embedded = await self.embeddings.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing, embedded, strict=True))
+            await self.embedding_cache.aset_many(fresh)
+            vectors = [fresh.get(key, vector) for key, vector in zip(keys, vectors, strict=True)]
+
+        logger.debug(f"Embedded {len(missing)} of {len(texts)} texts (rest cached)")
+        return vectors
+
+    @asynccontextmanager
+    async def bulk_mode(self) -> AsyncIterator[None]:
+        """Disable HNSW indexing for the duration of a bulk upload.
+
+        The index is built once when the defaults are restored on exit,
+        instead of incrementally after every upserted batch.
+        """
+        logger.info(f"Enabling bulk mode for collection: {self.collection_name}")
+        await self.aclient.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+            hnsw_config=HnswConfigDiff(m=0),
+        )
+        try:
+            yield
+        finally:
+            await self.aclient.update_collection(
+                collection_name=self.collection_name,
+                optimizers_config=OptimizersConfigDiff(
+                    indexing_threshold=DEFAULT_INDEXING_THRESHOLD
+                ),
+                hnsw_config=HnswConfigDiff(m=DEFAULT_HNSW_M),
+            )
+            logger.info(f"Bulk mode disabled for collection: {self.collection_name}")
+
     def search(
         self,
         query: str,
@@ -173,72 +473,105 @@ class VectorStoreService:
         self.client.delete_collection(self.collection_name)
         logger.info(f"Collection '{self.collection_name}' deleted")
 
+        _info_cache.pop(hashkey(self.collection_name), None)
+
+        # Recreate an empty collection so the cached service stays usable
+        self._ensured.discard(self.collection_name)
+        self._ensure_collection()
+
     def get_collection_info(self) -> dict:
         """Get information about the collection.
 
+        Results are cached for a few seconds so bursty callers don't each
+        hit Qdrant.
+
         Returns:
             Dictionary with collection statistics
         """
-        try:
-            info = self.client.get_collection(self.collection_name)
-            return {
-                "name": self.collection_name,
-                "points_count": info.points_count,
-                "indexed_vectors_count": info.indexed_vectors_count,
-                "status": info.status.value,
-            }
-        except UnexpectedResponse:
-            return {
-                "name": self.collection_name,
-                "points_count": 0,
-                "indexed_vectors_count": 0,
-                "status": "not_found",
-            }
-
-    def get_all_documents(self, limit: int = 10000) -> list[Document]:
+        return _cached_collection_info(self.client, self.collection_name)
+
+    @staticmethod
+    def _point_to_document(point: Any) -> Document:
+        """Convert a Qdrant point into a LangChain Document.
+
+        Handles both LangChain's nested layout and flat payloads in a single
+        pass. A flat payload is consumed in place and reused as the metadata.
+
+        Args:
+            point: Qdrant record returned by scroll
+
+        Returns:
+            Document built from the point payload
+        """
+        payload = point.payload or {}
+        if not isinstance(payload, dict):
+            return Document(page_content="", metadata={})
+
+        metadata = payload.get("metadata")
+        if metadata is not None:
+            content = payload.get("page_content") or payload.get("content") or ""
+        else:
+            # Flat metadata: strip the known content fields and keep the rest
+            page_content = payload.pop("page_content", None)
+            raw_content = payload.pop("content", None)
+            payload.pop("text", None)
+            content = page_content or raw_content or ""
+            metadata = payload
+
+        return Document(page_content=content, metadata=metadata)
+
+    def iter_all_documents(
+        self,
+        page_size: int = 1024,
+        fields: list[str] | None = None,
+    ) -> Iterator[Document]:
+        """Iterate over all documents in the vector store, one page at a time.
+
+        Args:
+            page_size: Number of points fetched per scroll request
+            fields: Payload keys to fetch (e.g. ["metadata.source"]); all if None
+
+        Yields:
+            Document objects
+        """
+        with_payload = PayloadSelectorInclude(include=fields) if fields else True
+        offset = None
+
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=False,  # We don't need vectors for metadata extraction
+            )
+            for point in points:
+                yield self._point_to_document(point)
+
+            if offset is None:
+                return
+
+    def get_all_documents(
+        self,
+        limit: int = 10000,
+        fields: list[str] | None = None,
+    ) -> list[Document]:
         """Get all documents from the vector store.
 
         Args:
             limit: Maximum number of documents to retrieve
+            fields: Payload keys to fetch (e.g. ["metadata.source"]); all if None
 
         Returns:
             List of all Document objects
         """
         logger.debug(f"Retrieving all documents (limit={limit})")
-        
+
         try:
-            # Use scroll to get all points from Qdrant
-            points, _ = self.client.scroll(
-                collection_name=self.collection_name,
-                limit=limit,
-                with_payload=True,
-                with_vectors=False,  # We don't need vectors for metadata extraction
+            documents = list(
+                islice(self.iter_all_documents(page_size=min(limit, 1024), fields=fields), limit)
             )
-            
-            documents = []
-            for point in points:
-                # LangChain Qdrant stores data in payload
-                # The structure may vary, so we handle both nested and flat structures
-                payload = point.payload or {}
-                
-                # Try to get page_content and metadata
-                # LangChain Qdrant may store them directly or nested
-                if isinstance(payload, dict):
-                    content = payload.get("page_content") or payload.get("content") or ""
-                    # Metadata might be nested or flat
-                    if "metadata" in payload:
-                        metadata = payload["metadata"]
-                    else:
-                        # If metadata is flat, extract it (excluding known fields)
-                        metadata = {k: v for k, v in payload.items() 
-                                  if k not in ["page_content", "content", "text"]}
-                else:
-                    content = ""
-                    metadata = {}
-                
-                doc = Document(page_content=content, metadata=metadata)
-                documents.append(doc)
-            
+
             logger.debug(f"Retrieved {len(documents)} documents")
             return documents
         except Exception as e:
@@ -252,17 +585,28 @@ class VectorStoreService:
             List of unique document filenames/sources
         """
         logger.debug("Retrieving unique document names")
-        
+
         try:
-            documents = self.get_all_documents()
-            unique_sources = set()
-            
-            for doc in documents:
-                source = doc.metadata.get("source")
-                if source:
-                    unique_sources.add(source)
-            
-            unique_sources_list = sorted(list(unique_sources))
+            try:
+                # Distinct values are computed server-side from the keyword index
+                response = self.client.facet(
+                    collection_name=self.collection_name,
+                    key=SOURCE_FIELD,
+                    limit=SOURCE_FACET_LIMIT,
+                )
+                unique_sources = {hit.value for hit in response.hits}
+                if len(response.hits) >= SOURCE_FACET_LIMIT:
+                    logger.warning(f"Document list truncated to {SOURCE_FACET_LIMIT} sources")
+            except UnexpectedResponse as e:
+                # Older servers or collections without a source index
+                logger.debug(f"Facet unavailable, falling back to scroll: {e}")
+                unique_sources = {
+                    doc.metadata["source"]
+                    for doc in self.iter_all_documents(fields=[SOURCE_FIELD])
+                    if doc.metadata.get("source")
+                }
+
+            unique_sources_list = sorted(unique_sources)
             logger.info(f"Found {len(unique_sources_list)} unique document sources")
             return unique_sources_list
         except Exception as e:
@@ -279,16 +623,20 @@ class VectorStoreService:
             List of Document objects from the specified source
         """
         logger.debug(f"Retrieving documents for source: {source}")
-        
+
         try:
-            # Get all documents and filter by source in Python
-            # This is simpler and more reliable than Qdrant filtering
-            all_docs = self.get_all_documents()
-            filtered_docs = [
-                doc for doc in all_docs 
-                if doc.metadata.get("source") == source
-            ]
-            
+            # Filter server-side on the indexed source field
+            points, _ = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=Filter(
+                    must=[FieldCondition(key=SOURCE_FIELD, match=MatchValue(value=source))]
+                ),
+                limit=10000,
+                with_payload=True,
+                with_vectors=False,
+            )
+            filtered_docs = [self._point_to_document(point) for point in points]
+
             logger.debug(f"Retrieved {len(filtered_docs)} chunks for source: {source}")
             return filtered_docs
         except Exception as e:
@@ -298,12 +646,66 @@ class VectorStoreService:
     def health_check(self) -> bool:
         """Check if vector store is healthy.
 
+        Results are cached for a few seconds so frequent probes don't each
+        hit Qdrant.
+
         Returns:
             True if healthy, False otherwise
         """
-        try:
-            self.client.get_collections()
-            return True
-        except Exception as e:
-            logger.error(f"Vector store health check failed: {e}")
-            return False
\ No newline at end of file
+        return _cached_health_check(self.client)
+
+
+@cached(_info_cache, key=lambda _client, collection_name: hashkey(collection_name), lock=Lock())
+def _cached_collection_info(client: QdrantClient, collection_name: str) -> dict:
+    """Fetch collection statistics from Qdrant (cached per collection).
+
+    Args:
+        client: Qdrant client
+        collection_name: Name of the collection
+
+    Returns:
+        Dictionary with collection statistics
+    """
+    try:
+        info = client.get_collection(collection_name)
+        return {
+            "name": collection_name,
+            "points_count": info.points_count,
+            "indexed_vectors_count": info.indexed_vectors_count,
+            "status": info.status.value,
+        }
+    except UnexpectedResponse:
+        return {
+            "name": collection_name,
+            "points_count": 0,
+            "indexed_vectors_count": 0,
+            "status": "not_found",
+        }
+
+
+@cached(_health_cache, key=lambda _client: hashkey(), lock=Lock())
+def _cached_health_check(client: QdrantClient) -> bool:
+    """Check Qdrant connectivity (cached).
+
+    Args:
+        client: Qdrant client
+
+    Returns:
+        True if healthy, False otherwise
+    """
+    try:
+        client.get_collections()
+        return True
+    except Exception as e:
+        logger.error(f"Vector store health check failed: {e}")
+        return False
+
+
+@lru_cache
+def get_vector_store() -> VectorStoreService:
+    """Get cached vector store service instance.
+
+    Returns:
+        Shared VectorStoreService for the default collection
+    """
+    return VectorStoreService()
@@ -1,8 +1,16 @@
-"""Pytest configuration and fixtures."""
+"""Pytest configuration and fixtures.
+
+Tests run in-process on pytest-xdist workers (``--dist=loadfile``, no
+``--forked``). Test modules must not import anything that spawns child
+processes at import time (e.g. ``torch.multiprocessing``); if that becomes
+necessary, move those tests to their own module marked with
+``@pytest.mark.xdist_group("heavy")``.
+"""
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
@@ -13,6 +21,11 @@ os.environ["QDRANT_API_KEY"] = "test-qdrant-key"
 os.environ["LOG_LEVEL"] = "WARNING"
 
 
+def _json(response):
+    """Decode a test client response body with orjson."""
+    return orjson.loads(response.content)
+
+
 @pytest.fixture
 def mock_settings():
     """Mock settings for testing."""
@@ -44,185 +57,204 @@ def mock_settings():
         yield settings
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_qdrant_client():
     """Mock Qdrant client."""
-    with patch("app.core.vector_store.get_qdrant_client") as mock:
-        client = MagicMock()
-        client.get_collections.return_value = MagicMock(collections=[])
-        client.get_collection.return_value = MagicMock(
-            points_count=10,
-            vectors_count=10,
-            status=MagicMock(value="green"),
-        )
-        mock.return_value = client
-        yield client
+    client = MagicMock()
+    client.get_collections.return_value = MagicMock(collections=[])
+    client.get_collection.return_value = MagicMock(
+        points_count=10,
+        vectors_count=10,
+        status=MagicMock(value="green"),
+    )
+    return client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_embeddings():
     """Mock OpenAI embeddings."""
-    with patch("app.core.embeddings.get_embeddings") as mock:
-        embeddings = MagicMock()
-        embeddings.embed_query.return_value = [0.1] * 1536
-        embeddings.embed_documents.return_value = [[0.1] * 1536]
-        mock.return_value = embeddings
-        yield embeddings
+    embeddings = MagicMock()
+    embeddings.embed_query.return_value = [0.1] * 1536
+    embeddings.embed_documents.return_value = [[0.1] * 1536]
+    return embeddings
 
 
-@pytest.fixture
-def mock_vector_store(mock_qdrant_client, mock_embeddings):
-    """Mock vector store service."""
-    with patch("app.core.vector_store.VectorStoreService") as mock:
-        service = MagicMock()
-        service.health_check.return_value = True
-        service.get_collection_info.return_value = {
-            "name": "test_collection",
-            "points_count": 10,
-            "vectors_count": 10,
-            "status": "green",
-        }
-        service.add_documents.return_value = ["id1", "id2"]
-        service.search.return_value = []
-        mock.return_value = service
-        yield service
-
+@pytest.fixture(scope="session")
+def mock_vector_store():
+    """Mock vector store service.
 
-@pytest.fixture
+    Session-scoped, so nothing is patched at module level; routes receive it
+    through ``app.dependency_overrides`` in the ``client`` fixture.
+    """
+    service = MagicMock()
+    service.health_check.return_value = True
+    service.get_collection_info.return_value = {
+        "name": "test_collection",
+        "points_count": 10,
+        "vectors_count": 10,
+        "status": "green",
+    }
+    service.aadd_documents = AsyncMock(return_value=["id1", "id2"])
+    service.search.return_value = []
+    return service
+
+
+@pytest.fixture(scope="session")
 def mock_rag_chain():
     """Mock RAG chain."""
-    with patch("app.api.routes.query.RAGChain") as mock:
-        chain = MagicMock()
-        chain.query.return_value = "This is a test answer."
+    chain = MagicMock()
+    chain.query.return_value = "This is a test answer."
 
-        # Use AsyncMock for async methods
-        async def mock_aquery(question):
-            return "This is a test answer."
+    # Use AsyncMock for async methods
+    async def mock_aquery(question):
+        return "This is a test answer."
 
-        async def mock_aquery_with_sources(question):
-            return {
-                "answer": "This is a test answer.",
-                "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
-            }
-
-        chain.aquery = mock_aquery
-        chain.aquery_with_sources = mock_aquery_with_sources
-
-        chain.query_with_sources.return_value = {
+    async def mock_aquery_with_sources(question):
+        return {
             "answer": "This is a test answer.",
             "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
         }
-        mock.return_value = chain
-        yield chain
 
+    chain.aquery = mock_aquery
+    chain.aquery_with_sources = mock_aquery_with_sources
 
-@pytest.fixture
+    chain.query_with_sources.return_value = {
+        "answer": "This is a test answer.",
+        "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
+    }
+    return chain
+
+
+@pytest.fixture(scope="session")
 def mock_rag_chain_with_evaluation():
     """Mock RAG chain with evaluation support."""
-    with patch("app.api.routes.query.RAGChain") as mock:
-        chain = MagicMock()
-        chain.query.return_value = "This is a test answer."
-
-        # Use async functions for async methods
-        async def mock_aquery(question):
-            return "This is a test answer."
-
-        async def mock_aquery_with_sources(question):
-            return {
-                "answer": "This is a test answer.",
-                "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
-            }
-
-        async def mock_aquery_with_evaluation(question, include_sources=True):
-            return {
-                "answer": "This is a test answer.",
-                "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
-                "evaluation": {
-                    "faithfulness": 0.95,
-                    "answer_relevancy": 0.87,
-                    "evaluation_time_ms": 1200.5,
-                    "error": None,
-                },
-            }
-
-        chain.aquery = mock_aquery
-        chain.aquery_with_sources = mock_aquery_with_sources
-        chain.aquery_with_evaluation = mock_aquery_with_evaluation
-
-        chain.query_with_sources.return_value = {
+    chain = MagicMock()
+    chain.query.return_value = "This is a test answer."
+
+    # Use async functions for async methods
+    async def mock_aquery(question):
+        return "This is a test answer."
+
+    async def mock_aquery_with_sources(question):
+        return {
+            "answer": "This is a test answer.",
+            "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
+        }
+
+    async def mock_aquery_with_evaluation(question, include_sources=True):
+        return {
             "answer": "This is a test answer.",
             "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
+            "evaluation": {
+                "faithfulness": 0.95,
+                "answer_relevancy": 0.87,
+                "evaluation_time_ms": 1200.5,
+                "error": None,
+            },
         }
-        mock.return_value = chain
-        yield chain
 
+    chain.aquery = mock_aquery
+    chain.aquery_with_sources = mock_aquery_with_sources
+    chain.aquery_with_evaluation = mock_aquery_with_evaluation
 
-@pytest.fixture
+    chain.query_with_sources.return_value = {
+        "answer": "This is a test answer.",
+        "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
+    }
+    return chain
+
+
+@pytest.fixture(scope="session")
 def mock_rag_chain_with_evaluation_error():
     """Mock RAG chain with evaluation error."""
-    with patch("app.api.routes.query.RAGChain") as mock:
-        chain = MagicMock()
-        chain.query.return_value = "This is a test answer."
-
-        # Use async functions for async methods
-        async def mock_aquery(question):
-            return "This is a test answer."
-
-        async def mock_aquery_with_sources(question):
-            return {
-                "answer": "This is a test answer.",
-                "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
-            }
-
-        async def mock_aquery_with_evaluation(question, include_sources=True):
-            return {
-                "answer": "This is a test answer.",
-                "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
-                "evaluation": {
-                    "faithfulness": None,
-                    "answer_relevancy": None,
-                    "evaluation_time_ms": None,
-                    "error": "Evaluation timeout after 30s",
-                },
-            }
-
-        chain.aquery = mock_aquery
-        chain.aquery_with_sources = mock_aquery_with_sources
-        chain.aquery_with_evaluation = mock_aquery_with_evaluation
-
-        chain.query_with_sources.return_value = {
+    chain = MagicMock()
+    chain.query.return_value = "This is a test answer."
+
+    # Use async functions for async methods
+    async def mock_aquery(question):
+        return "This is a test answer."
+
+    async def mock_aquery_with_sources(question):
+        return {
             "answer": "This is a test answer.",
             "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
         }
-        mock.return_value = chain
-        yield chain
 
+    async def mock_aquery_with_evaluation(question, include_sources=True):
+        return {
+            "answer": "This is a test answer.",
+            "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
+            "evaluation": {
+                "faithfulness": None,
+                "answer_relevancy": None,
+                "evaluation_time_ms": None,
+                "error": "Evaluation timeout after 30s",
+            },
+        }
 
-@pytest.fixture
+    chain.aquery = mock_aquery
+    chain.aquery_with_sources = mock_aquery_with_sources
+    chain.aquery_with_evaluation = mock_aquery_with_evaluation
+
+    chain.query_with_sources.return_value = {
+        "answer": "This is a test answer.",
+        "sources": [{"content": "Test content", "metadata": {"source": "test.pdf"}}],
+    }
+    return chain
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(request):
+    """Clear call history on session-scoped mocks used by the current test."""
+    for name in (
+        "mock_qdrant_client",
+        "mock_embeddings",
+        "mock_vector_store",
+        "mock_rag_chain",
+        "mock_rag_chain_with_evaluation",
+        "mock_rag_chain_with_evaluation_error",
+    ):
+        if name in request.fixturenames:
+            request.getfixturevalue(name).reset_mock()
+
+
+@pytest.fixture(scope="session")
 def client(mock_vector_store, mock_rag_chain):
-    """Create test client with mocked dependencies."""
+    """Create test client with mocked dependencies.
+
+    The app lifespan runs once per session; specialised clients below swap
+    dependency overrides on this shared instance.
+    """
+    from app.api.dependencies import provide_rag_chain, provide_vector_store
     from app.main import app
 
+    app.dependency_overrides[provide_vector_store] = lambda: mock_vector_store
+    app.dependency_overrides[provide_rag_chain] = lambda: mock_rag_chain
     with TestClient(app) as test_client:
         yield test_client
+    app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def client_with_evaluation(mock_vector_store, mock_rag_chain_with_evaluation):
+def client_with_evaluation(client, mock_rag_chain, mock_rag_chain_with_evaluation):
     """Create test client with evaluation mock."""
-    from app.main import app
+    from app.api.dependencies import provide_rag_chain
 
-    with TestClient(app) as test_client:
-        yield test_client
+    client.app.dependency_overrides[provide_rag_chain] = lambda: mock_rag_chain_with_evaluation
+    yield client
+    client.app.dependency_overrides[provide_rag_chain] = lambda: mock_rag_chain
 
 
 @pytest.fixture
-def client_with_evaluation_error(mock_vector_store, mock_rag_chain_with_evaluation_error):
+def client_with_evaluation_error(client, mock_rag_chain, mock_rag_chain_with_evaluation_error):
     """Create test client with evaluation error mock."""
-    from app.main import app
+    from app.api.dependencies import provide_rag_chain
 
-    with TestClient(app) as test_client:
-        yield test_client
+    client.app.dependency_overrides[provide_rag_chain] = lambda: (
+        mock_rag_chain_with_evaluation_error
+    )
+    yield client
+    client.app.dependency_overrides[provide_rag_chain] = lambda: mock_rag_chain
 
 
 @pytest.fixture
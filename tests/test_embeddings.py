@@ -0,0 +1,39 @@
+"""Tests for the embedding cache."""
+
+from array import array
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.embeddings import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test embedding cache functionality."""
+
+    async def test_memory_stores_compact_arrays(self):
+        """Test that vectors are kept as float32 arrays and returned as lists."""
+        cache = EmbeddingCache(model_name="test-model", max_size=10)
+        key = cache.key("text")
+
+        await cache.aset_many({key: [0.5, 0.25]})
+
+        assert isinstance(cache._memory[key], array)
+        assert await cache.aget_many([key, cache.key("other")]) == [[0.5, 0.25], None]
+
+    async def test_lru_evicts_oldest(self):
+        """Test that the in-memory cache is bounded."""
+        cache = EmbeddingCache(model_name="test-model", max_size=1)
+        first, second = cache.key("first"), cache.key("second")
+
+        await cache.aset_many({first: [0.25]})
+        await cache.aset_many({second: [0.5]})
+
+        assert await cache.aget_many([first, second]) == [None, [0.5]]
+
+    async def test_malformed_redis_value_is_a_miss(self):
+        """Test that a corrupt Redis entry is ignored instead of raising."""
+        cache = EmbeddingCache(model_name="test-model", max_size=10)
+        valid, corrupt = cache.key("valid"), cache.key("corrupt")
+        cache._redis = MagicMock(mget=AsyncMock(return_value=[array("f", [0.5]).tobytes(), b"abc"]))
+
+        assert await cache.aget_many([valid, corrupt]) == [[0.5], None]
+        assert corrupt not in cache._memory
@@ -1,5 +1,11 @@
 """Tests for health check endpoints."""
 
+from unittest.mock import Mock
+
+import pytest
+
+from tests.conftest import _json
+
 
 class TestHealthEndpoints:
     """Test health check endpoints."""
@@ -9,40 +15,53 @@ class TestHealthEndpoints:
         response = client.get("/health")
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["status"] == "healthy"
-        assert "timestamp" in data
-        assert "version" in data
+        assert {"timestamp", "version"} <= data.keys()
 
     def test_root_endpoint(self, client):
         """Test root endpoint."""
         response = client.get("/")
 
         assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "version" in data
-        assert "docs" in data
+        data = _json(response)
+        assert {"message", "version", "docs"} <= data.keys()
 
     def test_readiness_check(self, client, mock_vector_store):
         """Test readiness check endpoint."""
         response = client.get("/health/ready")
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["status"] == "ready"
         assert data["qdrant_connected"] is True
         assert "collection_info" in data
 
+    def test_readiness_check_vector_store_unavailable(self, client, monkeypatch):
+        """Test that a vector store that cannot be built reports 503."""
+        from app.api.dependencies import provide_vector_store
+
+        monkeypatch.delitem(client.app.dependency_overrides, provide_vector_store)
+        monkeypatch.setattr(
+            "app.api.dependencies.get_vector_store",
+            Mock(side_effect=ConnectionError("Connection refused")),
+        )
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert "Connection refused" in _json(response)["detail"]
+
+    @pytest.mark.slow
     def test_docs_available(self, client):
         """Test that Swagger docs are available."""
         response = client.get("/docs")
         assert response.status_code == 200
 
+    @pytest.mark.slow
     def test_openapi_available(self, client):
         """Test that OpenAPI schema is available."""
         response = client.get("/openapi.json")
         assert response.status_code == 200
-        data = response.json()
-        assert "openapi" in data
-        assert "paths" in data
+        data = _json(response)
+        assert {"openapi", "paths"} <= data.keys()
@@ -1,118 +1,138 @@
 """Tests for RAGAS evaluator module."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
+import pandas as pd
 import pytest
-from datasets import Dataset
+from ragas import EvaluationDataset
 
+from app.config import Settings
 from app.core.ragas_evaluator import RAGASEvaluator
 
 
+@pytest.fixture(scope="module")
+def evaluator():
+    """Shared evaluator with mocked OpenAI clients."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.core.ragas_evaluator.ChatOpenAI", MagicMock())
+        mp.setattr("app.core.ragas_evaluator.OpenAIEmbeddings", MagicMock())
+        yield RAGASEvaluator()
+
+
+@pytest.fixture
+def mock_chat_openai(monkeypatch):
+    """Replace the evaluation LLM class."""
+    mock = MagicMock()
+    monkeypatch.setattr("app.core.ragas_evaluator.ChatOpenAI", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_openai_embeddings(monkeypatch):
+    """Replace the evaluation embeddings class."""
+    mock = MagicMock()
+    monkeypatch.setattr("app.core.ragas_evaluator.OpenAIEmbeddings", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_evaluate(monkeypatch):
+    """Replace the RAGAS evaluate function."""
+    mock = MagicMock()
+    monkeypatch.setattr("app.core.ragas_evaluator.evaluate", mock)
+    return mock
+
+
 class TestRAGASEvaluator:
     """Test suite for RAGASEvaluator class."""
 
-    @patch("app.core.ragas_evaluator.ChatOpenAI")
-    @patch("app.core.ragas_evaluator.OpenAIEmbeddings")
-    def test_evaluator_initialization(self, mock_embeddings, mock_llm):
+    def test_evaluator_initialization(self, evaluator):
         """Test that evaluator initializes correctly."""
-        evaluator = RAGASEvaluator()
-
         assert evaluator.llm is not None
         assert evaluator.embeddings is not None
         assert len(evaluator.metrics) == 2  # faithfulness and answer_relevancy
         assert evaluator.metrics[0].name == "faithfulness"
         assert evaluator.metrics[1].name == "answer_relevancy"
 
-    @patch("app.core.ragas_evaluator.ChatOpenAI")
-    @patch("app.core.ragas_evaluator.OpenAIEmbeddings")
-    @patch("app.core.ragas_evaluator.get_settings")
-    def test_evaluator_uses_separate_llm_config(self, mock_settings, mock_embeddings, mock_llm):
-        """Test that evaluator uses separate RAGAS LLM configuration when provided."""
-        # Setup mock settings with separate RAGAS LLM
-        settings = MagicMock()
-        settings.llm_model = "gpt-4o-mini"
-        settings.llm_temperature = 0.0
-        settings.embedding_model = "text-embedding-3-small"
-        settings.openai_api_key = "test-key"
-        settings.ragas_llm_model = "gpt-4o"  # Different model for evaluation
-        settings.ragas_llm_temperature = 0.1
-        settings.ragas_embedding_model = "text-embedding-3-large"
-        mock_settings.return_value = settings
-
-        evaluator = RAGASEvaluator()
-
-        # Verify ChatOpenAI was called with RAGAS-specific settings
-        mock_llm.assert_called_once_with(
-            model="gpt-4o",
-            temperature=0.1,
-            openai_api_key="test-key",
-        )
-
-        # Verify OpenAIEmbeddings was called with RAGAS-specific settings
-        mock_embeddings.assert_called_once_with(
-            model="text-embedding-3-large",
+    @pytest.mark.parametrize(
+        "ragas_cfg,expected",
+        [
+            (
+                {
+                    "ragas_llm_model": "gpt-4o",  # Different model for evaluation
+                    "ragas_llm_temperature": 0.1,
+                    "ragas_embedding_model": "text-embedding-3-large",
+                },
+                {
+                    "llm": {"model": "gpt-4o", "temperature": 0.1},
+                    "embeddings": {"model": "text-embedding-3-large"},
+                },
+            ),
+            (
+                {
+                    "ragas_llm_model": None,  # Will fall back to llm_model
+                    "ragas_llm_temperature": None,  # Will fall back to llm_temperature
+                    "ragas_embedding_model": None,  # Will fall back to embedding_model
+                },
+                {
+                    "llm": {"model": "gpt-4o-mini", "temperature": 0.0},
+                    "embeddings": {"model": "text-embedding-3-small"},
+                },
+            ),
+        ],
+        ids=["separate", "fallback"],
+    )
+    def test_evaluator_llm_config(
+        self, monkeypatch, mock_chat_openai, mock_openai_embeddings, ragas_cfg, expected
+    ):
+        """Test that evaluator uses RAGAS LLM settings and falls back to the defaults."""
+        settings = Settings.model_construct(
+            llm_model="gpt-4o-mini",
+            llm_temperature=0.0,
+            embedding_model="text-embedding-3-small",
             openai_api_key="test-key",
         )
+        for name, value in ragas_cfg.items():
+            setattr(settings, name, value)
+        monkeypatch.setattr("app.core.ragas_evaluator.get_settings", lambda: settings)
 
-    @patch("app.core.ragas_evaluator.ChatOpenAI")
-    @patch("app.core.ragas_evaluator.OpenAIEmbeddings")
-    @patch("app.core.ragas_evaluator.get_settings")
-    def test_evaluator_fallback_to_default_config(self, mock_settings, mock_embeddings, mock_llm):
-        """Test that evaluator falls back to default LLM when RAGAS config is None."""
-        # Setup mock settings without separate RAGAS LLM
-        settings = MagicMock()
-        settings.llm_model = "gpt-4o-mini"
-        settings.llm_temperature = 0.0
-        settings.embedding_model = "text-embedding-3-small"
-        settings.openai_api_key = "test-key"
-        settings.ragas_llm_model = None  # Will fall back to llm_model
-        settings.ragas_llm_temperature = None  # Will fall back to llm_temperature
-        settings.ragas_embedding_model = None  # Will fall back to embedding_model
-        mock_settings.return_value = settings
-
-        evaluator = RAGASEvaluator()
-
-        # Verify ChatOpenAI was called with default settings
-        mock_llm.assert_called_once_with(
-            model="gpt-4o-mini",
-            temperature=0.0,
-            openai_api_key="test-key",
-        )
+        RAGASEvaluator()
 
-        # Verify OpenAIEmbeddings was called with default settings
-        mock_embeddings.assert_called_once_with(
-            model="text-embedding-3-small",
-            openai_api_key="test-key",
+        mock_chat_openai.assert_called_once_with(**expected["llm"], openai_api_key="test-key")
+        mock_openai_embeddings.assert_called_once_with(
+            **expected["embeddings"], openai_api_key="test-key"
         )
 
-    def test_prepare_dataset(self):
+    def test_prepare_dataset(self, evaluator):
         """Test dataset preparation for RAGAS."""
-        evaluator = RAGASEvaluator()
-
         question = "What is RAG?"
         answer = "RAG stands for Retrieval-Augmented Generation"
         contexts = ["Context 1", "Context 2"]
 
         dataset = evaluator._prepare_dataset(question, answer, contexts)
 
-        assert isinstance(dataset, Dataset)
+        assert isinstance(dataset, EvaluationDataset)
         assert len(dataset) == 1
-        assert dataset[0]["question"] == question
-        assert dataset[0]["answer"] == answer
-        assert dataset[0]["contexts"] == contexts
+        assert dataset[0].user_input == question
+        assert dataset[0].response == answer
+        assert dataset[0].retrieved_contexts == contexts
 
-    @pytest.mark.asyncio
-    @patch("app.core.ragas_evaluator.evaluate")
-    async def test_aevaluate_success(self, mock_evaluate):
-        """Test successful async evaluation."""
-        # Setup mock
-        mock_result = MagicMock()
-        mock_result.to_pandas.return_value.to_dict.return_value = [
-            {"faithfulness": 0.95, "answer_relevancy": 0.87}
-        ]
-        mock_evaluate.return_value = mock_result
+    def test_result_to_rows(self, evaluator):
+        """Test conversion of a RAGAS result into score rows."""
+        frame = pd.DataFrame([{"user_input": "What is RAG?", "faithfulness": 0.95}])
+        result = MagicMock(to_pandas=MagicMock(return_value=frame))
 
-        evaluator = RAGASEvaluator()
+        rows = evaluator._result_to_rows(result)
+
+        assert rows == [{"user_input": "What is RAG?", "faithfulness": 0.95}]
+
+    async def test_aevaluate_success(self, monkeypatch, mock_evaluate, evaluator):
+        """Test successful async evaluation."""
+        monkeypatch.setattr(
+            evaluator,
+            "_result_to_rows",
+            lambda result: [{"faithfulness": 0.95, "answer_relevancy": 0.87}],
+        )
 
         question = "What is RAG?"
         answer = "RAG stands for Retrieval-Augmented Generation"
@@ -125,16 +145,14 @@ class TestRAGASEvaluator:
         assert result["error"] is None
         assert "evaluation_time_ms" in result
         assert result["evaluation_time_ms"] >= 0
+        # ragas.evaluate rejects metrics that are not a list
+        assert isinstance(mock_evaluate.call_args.kwargs["metrics"], list)
 
-    @pytest.mark.asyncio
-    @patch("app.core.ragas_evaluator.evaluate")
-    async def test_aevaluate_with_error(self, mock_evaluate):
+    async def test_aevaluate_with_error(self, mock_evaluate, evaluator):
         """Test evaluation error handling."""
         # Setup mock to raise exception
         mock_evaluate.side_effect = Exception("Evaluation failed")
 
-        evaluator = RAGASEvaluator()
-
         question = "What is RAG?"
         answer = "RAG stands for Retrieval-Augmented Generation"
         contexts = ["Context about RAG"]
@@ -147,10 +165,8 @@ class TestRAGASEvaluator:
         assert result["evaluation_time_ms"] is None
         assert result["error"] == "Evaluation failed"
 
-    def test_handle_evaluation_error(self):
+    def test_handle_evaluation_error(self, evaluator):
         """Test error handling returns correct format."""
-        evaluator = RAGASEvaluator()
-
         error = Exception("Test error")
         result = evaluator._handle_evaluation_error(error)
 
@@ -159,18 +175,10 @@ class TestRAGASEvaluator:
         assert result["evaluation_time_ms"] is None
         assert result["error"] == "Test error"
 
-    @pytest.mark.asyncio
-    @patch("app.core.ragas_evaluator.evaluate")
-    async def test_aevaluate_with_missing_metrics(self, mock_evaluate):
+    async def test_aevaluate_with_missing_metrics(self, monkeypatch, mock_evaluate, evaluator):
         """Test evaluation when some metrics are missing."""
-        # Setup mock with only one metric
-        mock_result = MagicMock()
-        mock_result.to_pandas.return_value.to_dict.return_value = [
-            {"faithfulness": 0.95}  # answer_relevancy missing
-        ]
-        mock_evaluate.return_value = mock_result
-
-        evaluator = RAGASEvaluator()
+        # Only one metric in the result; answer_relevancy missing
+        monkeypatch.setattr(evaluator, "_result_to_rows", lambda result: [{"faithfulness": 0.95}])
 
         question = "What is RAG?"
         answer = "RAG stands for Retrieval-Augmented Generation"
@@ -182,17 +190,13 @@ class TestRAGASEvaluator:
         assert result["answer_relevancy"] is None  # Should be None when missing
         assert result["error"] is None
 
-    @pytest.mark.asyncio
-    @patch("app.core.ragas_evaluator.evaluate")
-    async def test_aevaluate_with_empty_contexts(self, mock_evaluate):
+    async def test_aevaluate_with_empty_contexts(self, monkeypatch, mock_evaluate, evaluator):
         """Test evaluation with empty contexts list."""
-        mock_result = MagicMock()
-        mock_result.to_pandas.return_value.to_dict.return_value = [
-            {"faithfulness": 0.0, "answer_relevancy": 0.5}
-        ]
-        mock_evaluate.return_value = mock_result
-
-        evaluator = RAGASEvaluator()
+        monkeypatch.setattr(
+            evaluator,
+            "_result_to_rows",
+            lambda result: [{"faithfulness": 0.0, "answer_relevancy": 0.5}],
+        )
 
         question = "What is RAG?"
         answer = "RAG stands for Retrieval-Augmented Generation"
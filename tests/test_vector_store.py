@@ -0,0 +1,311 @@
+"""Tests for vector store service."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import Headers
+from langchain_core.documents import Document
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from app.core import vector_store as vector_store_module
+from app.core.embeddings import EmbeddingCache
+from app.core.vector_store import VectorStoreService
+
+
+@pytest.fixture
+def vector_store(monkeypatch):
+    """Create a VectorStoreService with mocked Qdrant clients and embeddings."""
+    monkeypatch.setattr(VectorStoreService, "_ensured", set())
+    vector_store_module._info_cache.clear()
+    vector_store_module._health_cache.clear()
+
+    with (
+        patch("app.core.vector_store.get_qdrant_client") as mock_client,
+        patch("app.core.vector_store.get_async_qdrant_client") as mock_aclient,
+        patch("app.core.vector_store.get_embeddings") as mock_embeddings,
+        patch("app.core.vector_store.get_embedding_cache") as mock_cache,
+    ):
+        mock_cache.return_value = EmbeddingCache(model_name="test-model", max_size=100)
+        mock_client.return_value = MagicMock()
+        mock_aclient.return_value = MagicMock(upsert=AsyncMock(), update_collection=AsyncMock())
+
+        embeddings = MagicMock()
+        embeddings.embed_documents.side_effect = lambda texts: [[0.1] * 1536 for _ in texts]
+
+        async def mock_aembed_documents(texts):
+            return [[0.1] * 1536 for _ in texts]
+
+        embeddings.aembed_documents = AsyncMock(side_effect=mock_aembed_documents)
+        mock_embeddings.return_value = embeddings
+
+        yield VectorStoreService(collection_name="test_collection")
+
+
+class TestVectorStoreService:
+    """Test vector store service functionality."""
+
+    async def test_aadd_documents_batches_upserts(self, vector_store, monkeypatch):
+        """Test that documents are embedded and upserted in batches."""
+        monkeypatch.setattr("app.core.vector_store.settings.embedding_batch_size", 4)
+        monkeypatch.setattr("app.core.vector_store.settings.upsert_batch_size", 2)
+        documents = [
+            Document(page_content=f"chunk {i}", metadata={"source": "test.txt"}) for i in range(5)
+        ]
+
+        ids = await vector_store.aadd_documents(documents)
+
+        assert len(ids) == 5
+        assert len(set(ids)) == 5
+        assert vector_store.embeddings.aembed_documents.await_count == 2
+        assert vector_store.aclient.upsert.await_count == 3
+
+        points = [
+            point
+            for call in vector_store.aclient.upsert.await_args_list
+            for point in call.kwargs["points"]
+        ]
+        assert [str(point.id) for point in points] == ids
+        assert points[0].payload == {
+            "page_content": "chunk 0",
+            "metadata": {"source": "test.txt"},
+        }
+        vector_store.aclient.update_collection.assert_not_awaited()
+
+    async def test_aadd_documents_uses_bulk_mode_for_large_uploads(self, vector_store, monkeypatch):
+        """Test that HNSW indexing is paused and restored around large uploads."""
+        monkeypatch.setattr("app.core.vector_store.BULK_MODE_THRESHOLD", 2)
+        documents = [Document(page_content=f"chunk {i}") for i in range(3)]
+
+        await vector_store.aadd_documents(documents)
+
+        calls = vector_store.aclient.update_collection.await_args_list
+        assert len(calls) == 2
+        assert calls[0].kwargs["hnsw_config"].m == 0
+        assert calls[0].kwargs["optimizers_config"].indexing_threshold == 0
+        assert calls[1].kwargs["hnsw_config"].m == 16
+        assert calls[1].kwargs["optimizers_config"].indexing_threshold == 20000
+
+    async def test_aadd_documents_reuses_cached_embeddings(self, vector_store):
+        """Test that repeated chunk content is embedded only once."""
+        documents = [Document(page_content="header"), Document(page_content="body")]
+
+        await vector_store.aadd_documents(documents + [Document(page_content="header")])
+        await vector_store.aadd_documents(documents)
+
+        embedded = [
+            text
+            for call in vector_store.embeddings.aembed_documents.await_args_list
+            for text in call.args[0]
+        ]
+        assert sorted(embedded) == ["body", "header"]
+
+    async def test_aadd_documents_ids_are_deterministic(self, vector_store):
+        """Test that re-adding the same chunks reuses their point IDs."""
+        documents = [
+            Document(page_content="chunk", metadata={"source": "a.txt"}),
+            Document(page_content="chunk", metadata={"source": "b.txt"}),
+        ]
+
+        first = await vector_store.aadd_documents(documents)
+        second = await vector_store.aadd_documents(documents)
+
+        assert first == second
+        assert first[0] != first[1]
+
+    async def test_aadd_documents_repeated_chunks_keep_distinct_ids(self, vector_store):
+        """Test that identical text at different chunk positions is not collapsed."""
+        documents = [
+            Document(page_content="footer", metadata={"source": "a.txt", "chunk": i})
+            for i in range(3)
+        ]
+
+        ids = await vector_store.aadd_documents(documents)
+
+        assert len(set(ids)) == 3
+
+    async def test_aadd_documents_accepts_generator(self, vector_store):
+        """Test that documents can be streamed from a generator in batches."""
+        documents = (Document(page_content=f"chunk {i}") for i in range(5))
+
+        ids = await vector_store.aadd_documents(documents, batch_size=2)
+
+        assert len(ids) == 5
+        assert vector_store.embeddings.aembed_documents.await_count == 3
+
+    async def test_aadd_documents_stops_on_failed_batch(self, vector_store):
+        """Test that a failed batch stops reading input and cancels other batches."""
+        consumed = 0
+
+        def documents():
+            nonlocal consumed
+            for i in range(40):
+                consumed += 1
+                yield Document(page_content=f"chunk {i}")
+
+        vector_store.embeddings.aembed_documents.side_effect = RuntimeError("embed failed")
+
+        with pytest.raises(RuntimeError, match="embed failed"):
+            await vector_store.aadd_documents(documents(), batch_size=2)
+
+        assert consumed < 40
+        assert vector_store.embeddings.aembed_documents.await_count <= 4
+        vector_store.aclient.upsert.assert_not_awaited()
+
+    async def test_aadd_documents_empty(self, vector_store):
+        """Test that adding no documents skips embedding and upsert."""
+        ids = await vector_store.aadd_documents([])
+
+        assert ids == []
+        vector_store.embeddings.aembed_documents.assert_not_awaited()
+        vector_store.aclient.upsert.assert_not_awaited()
+
+    def test_ensure_collection_runs_once_per_collection(self, vector_store):
+        """Test that repeated construction skips the collection round-trip."""
+        with (
+            patch("app.core.vector_store.get_qdrant_client", return_value=vector_store.client),
+            patch("app.core.vector_store.get_async_qdrant_client"),
+            patch("app.core.vector_store.get_embeddings"),
+            patch("app.core.vector_store.get_embedding_cache"),
+        ):
+            VectorStoreService(collection_name="test_collection")
+
+        vector_store.client.collection_exists.assert_called_once_with("test_collection")
+
+    def test_ensure_collection_creates_missing_collection(self, vector_store, monkeypatch):
+        """Test that a missing collection is created with payload indexes."""
+        monkeypatch.setattr(VectorStoreService, "_ensured", set())
+        vector_store.client.reset_mock()
+        vector_store.client.collection_exists.return_value = False
+
+        vector_store._ensure_collection()
+
+        vector_store.client.create_collection.assert_called_once()
+        indexed = {
+            call.kwargs["field_name"]
+            for call in vector_store.client.create_payload_index.call_args_list
+        }
+        assert indexed == {"metadata.source", "metadata.chunk", "metadata.page"}
+        vector_store.client.get_collection.assert_not_called()
+
+    def test_ensure_payload_indexes_tolerates_errors(self, vector_store):
+        """Test that index creation failures don't prevent service start."""
+        vector_store.client.reset_mock()
+        vector_store.client.create_payload_index.side_effect = Exception("already exists")
+
+        vector_store._ensure_payload_indexes()
+
+        assert vector_store.client.create_payload_index.call_count == 3
+
+    def test_get_collection_info_is_cached(self, vector_store):
+        """Test that repeated info requests within the TTL reuse one Qdrant call."""
+        vector_store.client.get_collection.return_value = MagicMock(
+            points_count=10, indexed_vectors_count=10, status=MagicMock(value="green")
+        )
+
+        first = vector_store.get_collection_info()
+        second = vector_store.get_collection_info()
+
+        assert first == second
+        assert first["points_count"] == 10
+        vector_store.client.get_collection.assert_called_once()
+
+    def test_health_check_is_cached(self, vector_store):
+        """Test that repeated health checks within the TTL reuse one Qdrant call."""
+        assert vector_store.health_check() is True
+        assert vector_store.health_check() is True
+        vector_store.client.get_collections.assert_called_once()
+
+    def test_delete_collection_recreates_collection(self, vector_store):
+        """Test that deleting the collection leaves an empty one in place."""
+        vector_store.delete_collection()
+
+        vector_store.client.delete_collection.assert_called_once_with("test_collection")
+        assert vector_store.client.collection_exists.call_count == 2
+
+    def test_get_unique_document_names_uses_facet(self, vector_store):
+        """Test that unique sources come from the facet API."""
+        vector_store.client.facet.return_value = MagicMock(
+            hits=[MagicMock(value="b.pdf"), MagicMock(value="a.txt")]
+        )
+
+        assert vector_store.get_unique_document_names() == ["a.txt", "b.pdf"]
+        vector_store.client.scroll.assert_not_called()
+
+    def test_get_unique_document_names_warns_when_truncated(self, vector_store, monkeypatch):
+        """Test that hitting the facet limit is logged."""
+        monkeypatch.setattr("app.core.vector_store.SOURCE_FACET_LIMIT", 2)
+        warning = MagicMock()
+        monkeypatch.setattr("app.core.vector_store.logger.warning", warning)
+        vector_store.client.facet.return_value = MagicMock(
+            hits=[MagicMock(value="b.pdf"), MagicMock(value="a.txt")]
+        )
+
+        assert vector_store.get_unique_document_names() == ["a.txt", "b.pdf"]
+        assert vector_store.client.facet.call_args.kwargs["limit"] == 2
+        warning.assert_called_once()
+
+    def test_get_unique_document_names_falls_back_to_scroll(self, vector_store):
+        """Test the paged scroll fallback when facet is unavailable."""
+        vector_store.client.facet.side_effect = UnexpectedResponse(
+            status_code=400, reason_phrase="Bad Request", content=b"", headers=Headers()
+        )
+        vector_store.client.scroll.side_effect = [
+            ([MagicMock(payload={"metadata": {"source": "b.pdf"}})], "next"),
+            ([MagicMock(payload={"metadata": {"source": "a.txt"}})], None),
+        ]
+
+        assert vector_store.get_unique_document_names() == ["a.txt", "b.pdf"]
+        assert vector_store.client.scroll.call_count == 2
+        assert vector_store.client.scroll.call_args.kwargs["offset"] == "next"
+
+    def test_get_documents_by_source_filters_server_side(self, vector_store):
+        """Test that source filtering is pushed into the Qdrant scroll."""
+        vector_store.client.scroll.return_value = (
+            [MagicMock(payload={"page_content": "chunk", "metadata": {"source": "a.txt"}})],
+            None,
+        )
+
+        documents = vector_store.get_documents_by_source("a.txt")
+
+        assert [doc.page_content for doc in documents] == ["chunk"]
+        assert documents[0].metadata == {"source": "a.txt"}
+        scroll_filter = vector_store.client.scroll.call_args.kwargs["scroll_filter"]
+        assert [condition.key for condition in scroll_filter.must] == ["metadata.source"]
+        assert scroll_filter.must[0].match.value == "a.txt"
+        assert scroll_filter.should is None
+
+    def test_get_all_documents_projects_fields(self, vector_store):
+        """Test that only the requested payload fields are fetched."""
+        vector_store.client.scroll.return_value = (
+            [MagicMock(payload={"metadata": {"source": "a.txt"}})],
+            None,
+        )
+
+        documents = vector_store.get_all_documents(fields=["metadata.source"])
+
+        assert documents[0].metadata == {"source": "a.txt"}
+        with_payload = vector_store.client.scroll.call_args.kwargs["with_payload"]
+        assert with_payload.include == ["metadata.source"]
+
+    def test_iter_all_documents_follows_scroll_cursor(self, vector_store):
+        """Test that documents are yielded page by page until the cursor ends."""
+        vector_store.client.scroll.side_effect = [
+            ([MagicMock(payload={"page_content": "one", "metadata": {}})], "next"),
+            ([MagicMock(payload={"page_content": "two", "metadata": {}})], None),
+        ]
+
+        documents = vector_store.iter_all_documents(page_size=1)
+
+        assert [doc.page_content for doc in documents] == ["one", "two"]
+        assert vector_store.client.scroll.call_args.kwargs["offset"] == "next"
+
+    def test_point_to_document_flat_payload(self):
+        """Test that flat payloads drop content fields from the metadata."""
+        point = MagicMock(
+            payload={"page_content": "body", "content": "dup", "text": "dup", "source": "a.txt"}
+        )
+
+        document = VectorStoreService._point_to_document(point)
+
+        assert document.page_content == "body"
+        assert document.metadata == {"source": "a.txt"}